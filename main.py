@@ -14,22 +14,50 @@ Content:
 - Please also note that the content could possibly give you a page summary of something you disagree with or are offended by
 - In such case, please use the reload button to get a new page summary (CTRL+R)
 
+Difficulty:
+- pass -e, -m or -h on the command line for easy, medium and hard modes respectively
+- a batch of page summaries is fetched concurrently at startup and filtered by word count
+- easy and medium cap the summary length, hard accepts any summary
+
 TODO:
-- allow command line arguments to be passed to change the difficulty of the test
-- allow cla's of -e, -m and -h to be passed for easy, medium and hard modes respectively
-- each mode will trigger a calculation on the API call to display content of a maximum number of words
-- this will be unlimited in the case of hard and only short sentences in the case of easy and medium(slightly longer)
-- we will do a mass call on the api and fill a list of sentences that could be used, and calculate the shorterst for the easy etc
-- could also find a source online of a normal distribution of all english words where easy compares
+- could find a source online of a normal distribution of all english words where easy compares
 - the sentence to the distribution of english words and will give a page summary with mostly common words
 """
 
 import pygame # for asynchronous sound
 import curses  # Terminal formatting module
+import sys # for the difficulty command line flags
+from concurrent.futures import ThreadPoolExecutor # for prefetching summaries in the background
 import time  # For WPM calculation
 import requests # for wiki api call
+from requests.adapters import HTTPAdapter # for connection pooling across reloads
+from urllib3.util.retry import Retry # for retrying transient API failures with backoff
 import unicodedata # for normalising page summaries so that accents over viwels can be ignored
 
+try:
+    import orjson # optional faster JSON parsing of API responses
+except ImportError:
+    orjson = None # fall back to requests' stdlib json parsing
+
+# Reuse a single session so urllib3 pools the TCP+TLS connection to wikipedia
+# instead of performing a fresh handshake on every API call (e.g. CTRL+R reloads)
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "User-Agent": "terminal_typing/1.0",
+    # Ask explicitly for compressed JSON; gzipped summaries are a fraction
+    # of the raw size, and requests decompresses them transparently
+    "Accept-Encoding": "gzip, deflate",
+    "Accept": "application/json",
+})
+# Retry transient wikipedia errors (rate limits, brief 5xx) at the pool
+# layer, reusing the established TLS session instead of surfacing an
+# "Error" screen that makes the user reload by hand
+_RETRY = Retry(total=3, backoff_factor=0.3,
+               status_forcelist=[429, 500, 502, 503, 504],
+               allowed_methods=["GET"])
+_SESSION.mount("https://", HTTPAdapter(max_retries=_RETRY,
+                                       pool_connections=4, pool_maxsize=4))
+
 def split_sentence(input_str: str, terminal_width: int) -> list[str]:
     """
     Split a sentence into smaller chunks to fit in the terminal,
@@ -49,22 +77,26 @@ def split_sentence(input_str: str, terminal_width: int) -> list[str]:
 
     sentence_list = []
     current_line_words = []
+    current_len = 0  # running length of the current line, avoids re-joining per word
 
     for word in words:
         if not current_line_words:
             # If the current line is empty, always add the first word
             # (even if it's longer than safe_width, it will form its own line)
             current_line_words.append(word)
+            current_len = len(word)
         else:
             # Check if the current word can be added to the existing line
             # +1 for the space character
-            if len(" ".join(current_line_words)) + 1 + len(word) <= safe_width:
+            if current_len + 1 + len(word) <= safe_width:
                 current_line_words.append(word)
+                current_len += 1 + len(word)
             else:
                 # Word doesn't fit, finalise current line
                 sentence_list.append(" ".join(current_line_words))
                 # Start a new line with the current word
                 current_line_words = [word]
+                current_len = len(word)
 
     # Add the last constructed line
     if current_line_words:
@@ -79,20 +111,99 @@ def split_sentence(input_str: str, terminal_width: int) -> list[str]:
 
 
 def remove_accents(input_str):
+    if input_str.isascii():
+        return input_str  # nothing to strip, skip the per-character NFKD pass
     nfkd_form = unicodedata.normalize('NFKD', input_str)
-    return u"".join([c for c in nfkd_form if not unicodedata.combining(c)])
+    return u"".join(c for c in nfkd_form if not unicodedata.combining(c))
 
 def get_sentence():
     url = "https://en.wikipedia.org/api/rest_v1/page/random/summary"
-    response = requests.get(url)
+    response = _SESSION.get(url, timeout=5, stream=False)
 
     if response.status_code == 200:
-        data = response.json()
+        # orjson parses the raw bytes directly, skipping the extra UTF-8
+        # decode that response.json() performs via response.text
+        data = orjson.loads(response.content) if orjson else response.json()
         title = data.get("title", "No title found")
         sentence = data.get("extract", "No summary found")
         return title, sentence
     else : return "Error", "Failed to retrieve data"
 
+# Fetch the next summary while the user is still typing the current one,
+# so CTRL+R reloads and restarts don't block on the network round-trip
+_executor = ThreadPoolExecutor(max_workers=2)
+_next_sentence = None
+
+# Maximum words per summary for each difficulty (None = unlimited)
+_DIFFICULTY_LIMITS = {"easy": 30, "medium": 80, "hard": None}
+_POOL_SIZE = 8  # summaries fetched per batch
+_sentence_pool = []
+
+def fetch_pool(n: int) -> list[tuple[str, str]]:
+    """
+    Fetch n random page summaries concurrently, so the batch costs roughly
+    one network round-trip of wall-clock time instead of n.
+    Args:
+        n: Number of summaries to request.
+    Returns:
+        A list of (title, sentence) pairs, excluding failed requests.
+    """
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        results = list(pool.map(lambda _: get_sentence(), range(n)))
+    return [(title, sentence) for title, sentence in results if title != "Error"]
+
+def fill_sentence_pool(difficulty: str) -> None:
+    """
+    Batch-fetch a pool of summaries and keep only those matching the chosen
+    difficulty's word limit. CTRL+R reloads then pop from this pool with no
+    network cost until it is exhausted.
+    """
+    try:
+        summaries = fetch_pool(_POOL_SIZE)
+    except requests.RequestException:
+        return  # fall back to on-demand fetching in take_next_sentence
+    limit = _DIFFICULTY_LIMITS.get(difficulty)
+    if limit is not None:
+        filtered = [pair for pair in summaries if len(pair[1].split()) <= limit]
+        summaries = filtered or summaries  # never leave the pool empty over a strict limit
+    _sentence_pool.extend(summaries)
+
+def take_next_sentence():
+    """
+    Return a (title, sentence) pair, preferring the batched pool, then one
+    already fetched in the background; queue the next fetch so it is ready
+    by the time the user reloads or finishes the test.
+    """
+    global _next_sentence
+    if _sentence_pool:
+        return _sentence_pool.pop()
+    if _next_sentence is None:
+        _next_sentence = _executor.submit(get_sentence)
+    title, sentence = _next_sentence.result()
+    _next_sentence = _executor.submit(get_sentence)  # refill for the next reload
+    return title, sentence
+
+# Mixer init and MP3 decode are too heavy for the reload path, so each
+# effect is decoded once here and reused for every test
+_SOUND_CACHE = {}
+_CHANNELS = {}
+
+def load_sounds():
+    """
+    Initialise the pygame mixer once and decode the sound effects into the
+    module-level cache. Safe to call repeatedly; later calls are no-ops.
+    """
+    if not _SOUND_CACHE:
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(4)
+        _SOUND_CACHE["good"] = pygame.mixer.Sound("sounds/typewriter_key.mp3")
+        _SOUND_CACHE["bad"] = pygame.mixer.Sound("sounds/clank1-91862.mp3")
+        # Reserve a channel per effect so playback skips SDL's scan for a
+        # free channel on every keystroke
+        _CHANNELS["good"] = pygame.mixer.Channel(0)
+        _CHANNELS["bad"] = pygame.mixer.Channel(1)
+
+
 def initialize_curses(stdscr):
     """
     Initialise curses settings for terminal interaction.
@@ -149,110 +260,128 @@ def typing_test(stdscr):
     Handles user interaction, tracks progress, and calculates WPM.
     """
 
-    # Sentence to type and initialise the necessary variables
-    title, sentence = get_sentence() # unpack sentence function to return title and summary
-    sentence = remove_accents(sentence) # remove accents from summary
-    if title == "Error":
-        stdscr.clear()
-        stdscr.addstr(2, 10, "API request failed. Please try again.", curses.A_BOLD)
-        stdscr.refresh()
-        stdscr.getch()  # Wait for user input before retrying
-        return  # Exit the function before running the rest
-
-    # initialise pygame components
-    pygame.mixer.init()
-    good_sound = pygame.mixer.Sound("sounds/typewriter_key.mp3")
-    bad_sound = pygame.mixer.Sound("sounds/clank1-91862.mp3")
+    # pygame components are initialised once and shared across reloads
+    load_sounds()
+    good_sound = _SOUND_CACHE["good"]
+    bad_sound = _SOUND_CACHE["bad"]
+    good_channel = _CHANNELS["good"]
+    bad_channel = _CHANNELS["bad"]
+
+    # Outer loop: one iteration per test, re-entered on CTRL+R reloads
+    # (no recursion, so reloads don't grow the call stack or reinitialise)
+    while True:
+        # Sentence to type and initialise the necessary variables
+        title, sentence = take_next_sentence() # prefetched in the background where possible
+        sentence = remove_accents(sentence) # remove accents from summary
+        if title == "Error":
+            stdscr.clear()
+            stdscr.addstr(2, 10, "API request failed. Please try again.", curses.A_BOLD)
+            stdscr.refresh()
+            stdscr.getch()  # Wait for user input before retrying
+            return  # Exit the function before running the rest
 
-    word_count = len(sentence.split(" "))  # Count words for WPM calculation
-    user_input = ""
-    index = 0  # Current position in the sentence
-    start_time = None  # Timing starts when the first character is typed
+        word_count = len(sentence.split(" "))  # Count words for WPM calculation
+        start_time = None  # Timing starts when the first character is typed
+        reload = False  # Set when the user asks for a fresh sentence
 
-    # Get screen dimensions for proper positioning
-    height, width = stdscr.getmaxyx()
+        # Get screen dimensions for proper positioning
+        height, width = stdscr.getmaxyx()
 
-    # # Ensure sentence isn't too long for the terminal
-    # if len(sentence) > width - 10:
-    #     sentence = sentence[:width - 15] + "..."
+        # # Ensure sentence isn't too long for the terminal
+        # if len(sentence) > width - 10:
+        #     sentence = sentence[:width - 15] + "..."
 
-    # Ensure no negative position values
-    title_x = max((width - len(title)) // 2, 0)
-    title_y = max(height // 2 - 2, 0)
-    sentence_x = max((width - len(sentence)) // 2, 0)
-    sentence_y = max(height // 2, 0)
+        # Ensure no negative position values
+        title_x = max((width - len(title)) // 2, 0)
+        title_y = max(height // 2 - 2, 0)
+        sentence_y = max(height // 2, 0)
 
-    # Display the title in the centre-top of the screen
-    stdscr.addstr(title_y, title_x, title.upper(), curses.A_BOLD)
+        # Display the title in the centre-top of the screen
+        stdscr.addstr(title_y, title_x, title.upper(), curses.A_BOLD)
 
-    # Display a sentence in the centre of the screen
-    # stdscr.addstr(sentence_y, sentence_x, sentence)
+        sentence_list = split_sentence(sentence, width)
 
-    sentence_list = split_sentence(sentence, width)
-    for index, line in enumerate(sentence_list):
-        start_x = max((width - len(line)) // 2, 0)
-        stdscr.addstr(sentence_y + index, start_x, line)
+        # Precompute each line's centring offset and length once, rather than
+        # redoing the arithmetic on every keystroke in the input loop below
+        line_offsets = [max((width - len(line)) // 2, 0) for line in sentence_list]
+        line_lens = [len(line) for line in sentence_list]
 
-    # need new variable to check user progress in sentence
-    current_line = 0
-    current_pos = 0
+        # Byte view of each line so key matching is an int == int comparison
+        # with no one-character str allocated per keystroke
+        sentence_bytes = [line.encode('latin-1', 'replace') for line in sentence_list]
 
-    user_input = [""] * len(sentence_list) # empty initially
+        for index, line in enumerate(sentence_list):
+            stdscr.addstr(sentence_y + index, line_offsets[index], line)
 
-    stdscr.refresh()
+        # need new variable to check user progress in sentence
+        current_line = 0
+        current_pos = 0
 
-    # Loop through the sentence until the user finishes
-    while current_line < len(sentence_list):
-        # Position the cursor at the start of the sentence
-        stdscr.move(sentence_y + current_line, max((width - len(sentence_list[current_line]))//2 + current_pos, 0))
-
-        key = stdscr.getch()  # Capture user key press
-        char = chr(key) if 32 <= key <= 126 else None  # 'Normalise' key input
-
-        if start_time is None:
-            start_time = time.time()  # Start the timer on the first key press
-
-        if char: # regular expected alphanumeric character
-            if current_pos < len(sentence_list[current_line]):
-                if char == sentence_list[current_line][current_pos]:
-                    # correct key entered, advance curor and updater user input
-                    good_sound.play()
-                    stdscr.addstr(sentence_y + current_line, (width - len(sentence_list[current_line])) // 2 + current_pos, char, curses.color_pair(2))  # Highlight green
-                    user_input[current_line] += char
-                    current_pos += 1
-                else:
-                    # incorrect key entered, advance curor and update user input
-                    bad_sound.play()
-                    stdscr.addstr(sentence_y + current_line, (width - len(sentence_list[current_line])) // 2 + current_pos, sentence_list[current_line][current_pos], curses.color_pair(3))  # Highlight red
-
-                # if we reached the end of the line
-                if current_pos == len(sentence_list[current_line]):
-                    # move to next line and reset cursor position
-                    current_line += 1
-                    current_pos = 0
-
-        elif key in (8, 127):  # Backspace
-            if current_pos > 0:
-                current_pos -= 1
-                user_input[current_line] = user_input[current_line][:-1]  # Remove last character
-                # Erase character on screen
-                stdscr.addstr(sentence_y + current_line,
-                              (width - len(sentence_list[current_line])) // 2 + current_pos,
-                              " ", curses.color_pair(3))
-
-            elif current_line > 0:
-                # Move back to the end of the previous line
-                current_line -= 1
-                current_pos = len(user_input[current_line])
-
-        elif key == 18: # ASCII CTRL+R
-            # refresh the API call and start again
-            stdscr.clear()
-            typing_test(stdscr)
+        # Per-line character buffers: appending to a list is O(1), whereas
+        # growing a string reallocates it on every keystroke
+        user_input = [[] for _ in sentence_list] # empty initially
 
-        # Refresh the screen
         stdscr.refresh()
 
+        # Loop through the sentence until the user finishes
+        while current_line < len(sentence_list):
+            # Position the cursor at the start of the sentence
+            stdscr.move(sentence_y + current_line, line_offsets[current_line] + current_pos)
+
+            key = stdscr.getch()  # Capture user key press
+
+            if start_time is None:
+                start_time = time.time()  # Start the timer on the first key press
+
+            if 32 <= key <= 126: # regular expected alphanumeric character
+                if current_pos < line_lens[current_line]:
+                    if key == sentence_bytes[current_line][current_pos]:
+                        # correct key entered, advance curor and updater user input
+                        char = chr(key)  # only materialise the str for display
+                        good_channel.play(good_sound)
+                        stdscr.addstr(sentence_y + current_line, line_offsets[current_line] + current_pos, char, curses.color_pair(2))  # Highlight green
+                        user_input[current_line].append(char)
+                        current_pos += 1
+                    else:
+                        # incorrect key entered, advance curor and update user input
+                        bad_channel.play(bad_sound)
+                        stdscr.addstr(sentence_y + current_line, line_offsets[current_line] + current_pos, sentence_list[current_line][current_pos], curses.color_pair(3))  # Highlight red
+
+                    # if we reached the end of the line
+                    if current_pos == line_lens[current_line]:
+                        # move to next line and reset cursor position
+                        current_line += 1
+                        current_pos = 0
+
+            elif key in (8, 127):  # Backspace
+                if current_pos > 0:
+                    current_pos -= 1
+                    user_input[current_line].pop()  # Remove last character
+                    # Erase character on screen
+                    stdscr.addstr(sentence_y + current_line,
+                                  line_offsets[current_line] + current_pos,
+                                  " ", curses.color_pair(3))
+
+                elif current_line > 0:
+                    # Move back to the end of the previous line
+                    current_line -= 1
+                    current_pos = len(user_input[current_line])
+
+            elif key == 18: # ASCII CTRL+R
+                # refresh the API call and start again from the outer loop
+                stdscr.clear()
+                reload = True
+                break
+
+            # Batch the screen update: noutrefresh stages the diff and a single
+            # doupdate writes it to the terminal before the next getch
+            stdscr.noutrefresh()
+            curses.doupdate()
+
+        if reload:
+            continue
+        break
+
     # break out of while loop when sentence is completed
     end_time = time.time()
 
@@ -326,6 +455,7 @@ def main(stdscr):
         print(f"Encountered error: {e}")  # Print errors outside curses mode
     finally:
         clean_up_curses(stdscr)  # Ensure terminal is restored
+        _executor.shutdown(wait=False, cancel_futures=True)
         pygame.mixer.quit()
         pygame.quit()
 
@@ -346,5 +476,13 @@ def clean_up_curses(stdscr):
 
 
 if __name__ == '__main__':
+    # Pick the difficulty from the command line (-e/-m/-h, defaulting to hard)
+    difficulty = "hard"
+    if "-e" in sys.argv[1:]:
+        difficulty = "easy"
+    elif "-m" in sys.argv[1:]:
+        difficulty = "medium"
+    fill_sentence_pool(difficulty)
+
     # Initialise curses wrapper which manages setup and teardown
     curses.wrapper(main)
\ No newline at end of file